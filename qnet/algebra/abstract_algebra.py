@@ -33,7 +33,7 @@ from copy import copy
 from functools import reduce
 
 from .pattern_matching import (
-    ProtoExpr, match_pattern, wc, pattern_head, pattern)
+    Pattern, ProtoExpr, match_pattern, wc, pattern_head, pattern)
 from .singleton import Singleton
 from .scalar_types import SCALAR_TYPES
 from ..printing import AsciiPrinter, LaTeXPrinter, UnicodePrinter
@@ -155,6 +155,9 @@ class Expression(metaclass=ABCMeta):
     # *must* call the corresponding superclass method *at the end*. Otherwise,
     # caching will not work correctly
 
+    # subclasses that do not define __slots__ get an instance __dict__ as usual
+    __slots__ = ('_hash', '_tex', '_ascii', '_unicode', '_instance_key')
+
     # Printer instances handling __str__, __repr__, etc.
     _str_printer = UnicodePrinter  # for __str__()
     _repr_printer = UnicodePrinter  # for __repr__()
@@ -172,6 +175,11 @@ class Expression(metaclass=ABCMeta):
     # we cache all instances of Expressions for fast construction
     _instances = {}
     instance_caching = True
+    # incremented whenever a temporary instance cache (or temporary rules) is
+    # activated or deactivated. Anything derived from instances and cached
+    # on them beyond the instance cache itself (e.g. Circuit.toSLH) is only
+    # valid for the generation in which it was computed
+    _instance_cache_generation = 0
 
     # eventually, we should ensure that the create method is idempotent, i.e.
     # expr.create(*expr.args, **expr.kwargs) == expr(*expr.args, **expr.kwargs)
@@ -549,6 +557,7 @@ class Operation(Expression, metaclass=ABCMeta):
     of the algebra!) Any other parameters (non-operands) that may be required
     must be given as keyword-arguments.
     """
+    __slots__ = ('_operands', )
 
     def __init__(self, *operands, **kwargs):
         self._operands = operands
@@ -637,6 +646,124 @@ def filter_neutral(cls, ops, kwargs):
         return ops[0]
 
 
+def _pattern_head(pat):
+    """The class (or tuple of classes) an expression must be an instance of
+    in order to match `pat`, or None if there is no such restriction"""
+    if (isinstance(pat, Pattern) and pat.mode == Pattern.single and
+            pat.head is not None):
+        if isinstance(pat.head, type):
+            return pat.head
+        return tuple(pat.head)
+    return None
+
+
+def _arg_heads(arg):
+    """Tuple of the :func:`_pattern_head` of the rule argument `arg` and of
+    the first and last argument of `arg` (if `arg` is a nested pattern)"""
+    head = _pattern_head(arg)
+    if head is None or not arg.args:
+        return (head, None, None)
+    return (head, _pattern_head(arg.args[0]), _pattern_head(arg.args[-1]))
+
+
+def _rule_arg_heads(expr_or_pattern):
+    """Tuple of :func:`_arg_heads` for all positional arguments of a rule
+    pattern, or None if the rule cannot be indexed"""
+    if not isinstance(expr_or_pattern, Pattern):
+        return None
+    if expr_or_pattern.args is None or expr_or_pattern._has_non_single_arg:
+        return None
+    return tuple(_arg_heads(arg) for arg in expr_or_pattern.args)
+
+
+def _wildcard_names(expr_or_pattern):
+    """If all positional arguments of a rule pattern are plain wildcards
+    (distinct names, no conditions, no sub-patterns, at most a `head`
+    restriction), return the tuple of their names; otherwise None.
+
+    For such a rule, operands that are compatible with the wildcard heads
+    (as ensured by :func:`_select_rules`) match by simply binding them to
+    these names."""
+    pat = expr_or_pattern
+    if (not isinstance(pat, Pattern) or pat.head not in (None, ProtoExpr) or
+            not pat.args or pat.kwargs is not None or pat.conditions):
+        return None
+    names = []
+    for arg in pat.args:
+        if not (isinstance(arg, Pattern) and arg.mode == Pattern.single and
+                arg.wc_name is not None and arg.args is None and
+                arg.kwargs is None and not arg.conditions):
+            return None
+        names.append(arg.wc_name)
+    if len(set(names)) < len(names):
+        return None
+    return tuple(names)
+
+
+def _operand_signature(op):
+    """Tuple of the type of `op` and the types of its first and last
+    argument, to be compared against :func:`_arg_heads`"""
+    if isinstance(op, Expression) and len(op.args) > 0:
+        return (type(op), type(op.args[0]), type(op.args[-1]))
+    return (type(op), None, None)
+
+
+def _may_match(arg_heads, signature):
+    """Check whether the operands with the given signature are compatible
+    with the heads of a rule"""
+    if arg_heads is None:
+        return True
+    if len(arg_heads) != len(signature):
+        return False
+    for (heads, types) in zip(arg_heads, signature):
+        for (head, type_) in zip(heads, types):
+            if not (head is None or type_ is None or issubclass(type_, head)):
+                return False
+    return True
+
+
+def _select_rules(cls, attr, ops):
+    """Subset of the rules in ``cls.<attr>`` (e.g. ``cls._rules``), in the
+    original order, that may match the positional operands `ops`, as a tuple
+    of ``(expr_or_pattern, replacement, wc_names)``, cf.
+    :func:`_wildcard_names` and :func:`_match_rule`.
+
+    The rules are indexed by the heads of their positional wildcards, and of
+    the first and last argument of nested patterns. The selection is cached
+    per operand signature in ``cls.<attr>_by_head`` and rebuilt if the list of
+    rules is replaced or changes its length (cf. :func:`extra_rules`,
+    :func:`extra_binary_rules`, :func:`no_rules`)
+    """
+    rules = getattr(cls, attr)
+    index_attr = attr + '_by_head'
+    index = getattr(cls, index_attr, None)
+    if index is None or index[0] is not rules or index[1] != len(rules):
+        heads = [_rule_arg_heads(pat) for (pat, replacement) in rules]
+        names = [_wildcard_names(pat) for (pat, replacement) in rules]
+        index = (rules, len(rules), heads, names, {})
+        setattr(cls, index_attr, index)
+    signature = tuple(_operand_signature(op) for op in ops)
+    try:
+        return index[4][signature]
+    except KeyError:
+        selected = tuple(
+            (pat, replacement, wc_names)
+            for ((pat, replacement), arg_heads, wc_names)
+            in zip(rules, index[2], index[3])
+            if _may_match(arg_heads, signature))
+        index[4][signature] = selected
+        return selected
+
+
+def _match_rule(expr_or_pattern, wc_names, expr):
+    """Match a rule returned by :func:`_select_rules` against the
+    :class:`ProtoExpr` `expr`. Rules with only plain wildcards bind the
+    operands directly, without going through :func:`match_pattern`"""
+    if wc_names is None:
+        return match_pattern(expr_or_pattern, expr)
+    return dict(zip(wc_names, expr.args))
+
+
 def match_replace(cls, ops, kwargs):
     """Match and replace a full operand specification to a function that
     provides a replacement for the whole expression
@@ -682,8 +809,9 @@ def match_replace(cls, ops, kwargs):
 
     """
     expr = ProtoExpr(ops, kwargs)
-    for expr_or_pattern, replacement in cls._rules:
-        match_dict = match_pattern(expr_or_pattern, expr)
+    rules = _select_rules(cls, '_rules', ops)
+    for expr_or_pattern, replacement, wc_names in rules:
+        match_dict = _match_rule(expr_or_pattern, wc_names, expr)
         if match_dict:
             try:
                 return replacement(**match_dict)
@@ -696,8 +824,8 @@ def match_replace(cls, ops, kwargs):
 def _get_binary_replacement(first, second, rules):
     """Helper function for match_replace_binary"""
     expr = ProtoExpr([first, second], {})
-    for exp_or_pattern, replacement in rules:
-        match_dict = match_pattern(exp_or_pattern, expr)
+    for exp_or_pattern, replacement, wc_names in rules:
+        match_dict = _match_rule(exp_or_pattern, wc_names, expr)
         if match_dict:
             try:
                 return replacement(**match_dict)
@@ -761,7 +889,8 @@ def _match_replace_binary_combine(cls, a: list, b: list) -> list:
     """combine two fully reduced lists a, b"""
     if len(a) == 0 or len(b) == 0:
         return a + b
-    r = _get_binary_replacement(a[-1], b[0], cls._binary_rules)
+    r = _get_binary_replacement(
+            a[-1], b[0], _select_rules(cls, '_binary_rules', (a[-1], b[0])))
     if r is None:
         return a + b
     if r == cls.neutral_element:
@@ -801,8 +930,10 @@ def temporary_instance_cache(cls):
     context will be used within the managed context, and vice versa"""
     orig_instances = cls._instances
     cls._instances = {}
+    Expression._instance_cache_generation += 1
     yield
     cls._instances = orig_instances
+    Expression._instance_cache_generation += 1
 
 
 @contextmanager
@@ -814,9 +945,11 @@ def extra_rules(cls, rules):
     cls._rules.extend(rules)
     orig_instances = cls._instances
     cls._instances = {}
+    Expression._instance_cache_generation += 1
     yield
     cls._rules = orig_rules
     cls._instances = orig_instances
+    Expression._instance_cache_generation += 1
 
 
 @contextmanager
@@ -828,9 +961,11 @@ def extra_binary_rules(cls, rules):
     cls._binary_rules.extend(rules)
     orig_instances = cls._instances
     cls._instances = {}
+    Expression._instance_cache_generation += 1
     yield
     cls._binary_rules = orig_rules
     cls._instances = orig_instances
+    Expression._instance_cache_generation += 1
 
 
 @contextmanager
@@ -853,9 +988,11 @@ def no_rules(cls):
         cls._binary_rules = []
     except AttributeError:
         has_binary_rules = False
+    Expression._instance_cache_generation += 1
     yield
     if has_rules:
         cls._rules = orig_rules
     if has_binary_rules:
         cls._binary_rules = orig_binary_rules
     cls._instances = orig_instances
+    Expression._instance_cache_generation += 1
@@ -31,8 +31,10 @@ References:
 """
 import os
 import re
+from bisect import bisect_right
 from abc import ABCMeta, abstractproperty, abstractmethod
-from functools import reduce
+from functools import reduce, lru_cache, wraps
+from itertools import groupby
 from collections import OrderedDict
 
 from sympy import symbols, sympify
@@ -126,6 +128,44 @@ def check_cdims(cls, ops, kwargs):
     return ops, kwargs
 
 
+def _delegates_to_method(cls, circuit):
+    """Check whether `circuit` is an instance of one of the classes in
+    ``cls.delegate_to_method``. The result is cached per type of `circuit` in
+    ``cls._delegate_types``, so that the isinstance-check against the full
+    tuple of classes happens only once for every type of circuit."""
+    circuit_type = type(circuit)
+    try:
+        return cls._delegate_types[circuit_type]
+    except KeyError:
+        delegates = isinstance(circuit, cls.delegate_to_method)
+        cls._delegate_types[circuit_type] = delegates
+        return delegates
+
+
+def _cache_feedback(meth):
+    """Decorator for a `_feedback` method that stores the resulting circuit
+    in the instance's ``_feedbacks`` dict, keyed by ``(out_port, in_port)``.
+    Circuits are immutable, but the result depends on the active rules, so
+    the dict is only used within the instance cache generation in which it
+    was filled (cf. :func:`.temporary_instance_cache`)."""
+
+    @wraps(meth)
+    def cached_feedback(self, *, out_port, in_port):
+        generation = Expression._instance_cache_generation
+        if self._feedbacks is None or self._feedbacks[0] != generation:
+            self._feedbacks = (generation, {})
+        feedbacks = self._feedbacks[1]
+        key = (out_port, in_port)
+        try:
+            return feedbacks[key]
+        except KeyError:
+            circuit = meth(self, out_port=out_port, in_port=in_port)
+            feedbacks[key] = circuit
+            return circuit
+
+    return cached_feedback
+
+
 ###############################################################################
 # Abstract base classes
 ###############################################################################
@@ -134,6 +174,11 @@ def check_cdims(cls, ops, kwargs):
 class Circuit(metaclass=ABCMeta):
     """Abstract base class for the circuit algebra elements."""
 
+    _block_offsets = None  # lazily evaluated, see index_in_block
+    _blocks = None  # block_structure -> blocks, see get_blocks
+    _slh = None  # (generation, SLH), lazily evaluated, see toSLH
+    _feedbacks = None  # (generation, dict), see _cache_feedback
+
     @abstractproperty
     def cdim(self) -> int:
         """The channel dimension of the circuit expression,
@@ -186,15 +231,16 @@ class Circuit(metaclass=ABCMeta):
         if channel_index < 0 or channel_index >= self.cdim:
             raise ValueError()
 
-        struct = self.block_structure
+        if self._block_offsets is None:
+            # channel index at which each block starts (lazily evaluated)
+            self._block_offsets = tuple(
+                    _cumsum((0, ) + self.block_structure[:-1]))
+        offsets = self._block_offsets
 
-        if len(struct) == 1:
+        if len(offsets) == 1:
             return channel_index, 0
-        i = 1
-        while sum(struct[:i]) <= channel_index and i < self.cdim:
-            i += 1
-        block_index = i - 1
-        index_in_block = channel_index - sum(struct[:block_index])
+        block_index = bisect_right(offsets, channel_index) - 1
+        index_in_block = channel_index - offsets[block_index]
 
         return index_in_block, block_index
 
@@ -217,10 +263,15 @@ class Circuit(metaclass=ABCMeta):
         """
         if block_structure is None:
             block_structure = self.block_structure
+        block_structure = tuple(block_structure)
+        if self._blocks is None:
+            self._blocks = {}
         try:
-            return self._get_blocks(block_structure)
-        except IncompatibleBlockStructures as e:
-            raise e
+            return self._blocks[block_structure]
+        except KeyError:
+            blocks = self._get_blocks(block_structure)
+            self._blocks[block_structure] = blocks
+            return blocks
 
     def _get_blocks(self, block_structure):
         if block_structure == self.block_structure:
@@ -318,7 +369,10 @@ class Circuit(metaclass=ABCMeta):
         left in the expression or if the circuit includes *non-passive* ABCD
         models (cf. [1]_)
         """
-        return self._toSLH()
+        generation = Expression._instance_cache_generation
+        if self._slh is None or self._slh[0] != generation:
+            self._slh = (generation, self._toSLH())
+        return self._slh[1]
 
     @abstractmethod
     def _toSLH(self) -> 'SLH':
@@ -834,6 +888,10 @@ class CPermutation(Circuit, Expression):
     """
     _simplifications = []
     _block_perms = None
+    _perm_array = None  # lazily evaluated, see _permutation_array
+    # below this number of channels, composing the image tuples directly is
+    # faster than going through numpy arrays
+    _numpy_min_cdim = 16
 
     def __init__(self, permutation):
         self._permutation = permutation
@@ -845,7 +903,7 @@ class CPermutation(Circuit, Expression):
         permutation = tuple(permutation)
         if not check_permutation(permutation):
             raise BadPermutationError(str(permutation))
-        if list(permutation) == list(range(len(permutation))):
+        if permutation == _identity_permutation(len(permutation)):
             return cid(len(permutation))
         return super().create(permutation)
 
@@ -871,6 +929,13 @@ class CPermutation(Circuit, Expression):
         """The permutation image tuple."""
         return self._permutation
 
+    @property
+    def _permutation_array(self):
+        """The permutation image tuple as a numpy integer array"""
+        if self._perm_array is None:
+            self._perm_array = np.array(self._permutation, dtype=np.intp)
+        return self._perm_array
+
     def _toSLH(self):
         return SLH(permutation_matrix(self.permutation),
                    zerosm((self.cdim, 1)), 0)
@@ -905,12 +970,18 @@ class CPermutation(Circuit, Expression):
         :return: The composite permutation circuit (could also be the identity circuit for n channels)
         :rtype: Circuit
         """
-        combined_permutation = tuple([self.permutation[p]
-                                      for p in other.permutation])
+        if self._cdim < self._numpy_min_cdim:
+            permutation = self._permutation
+            combined_permutation = tuple(
+                    [permutation[i] for i in other._permutation])
+        else:
+            combined_permutation = tuple(
+                    self._permutation_array.take(other._permutation_array)
+                    .tolist())
         return CPermutation.create(combined_permutation)
 
     def _series_inverse(self):
-        return CPermutation(invert_permutation(self.permutation))
+        return CPermutation.create(invert_permutation(self._permutation))
 
     @property
     def _block_structure(self):
@@ -974,17 +1045,25 @@ class CPermutation(Circuit, Expression):
         within_perm_circuit = Concatenation.create(*within_blocks)
         rhs_blocks = rhs.get_blocks(block_structure)
 
-        summands = [SeriesProduct.create(within_blocks[p], rhs_blocks[p])
-                    for p in invert_permutation(block_perm)]
-        permuted_rhs_circuit = Concatenation.create(*summands)
+        permuted_rhs_circuit = Concatenation.create(
+                *[SeriesProduct.create(within_blocks[p], rhs_blocks[p])
+                  for p in invert_permutation(block_perm)])
 
         new_lhs_circuit = (self << within_perm_circuit.series_inverse() <<
                            new_rhs_circuit.series_inverse())
 
         return new_lhs_circuit, permuted_rhs_circuit, new_rhs_circuit
 
+    @_cache_feedback
     def _feedback(self, *, out_port, in_port):
         n = self.cdim
+        if self.permutation[in_port] == out_port:
+            # the fed-back channel only connects to itself: drop it and
+            # close the gaps in the remaining port indices
+            return CPermutation.create(tuple(
+                    p - (p > out_port)
+                    for (i, p) in enumerate(self.permutation)
+                    if i != in_port))
         new_perm_circuit = (
                 map_signals_circuit({out_port: (n - 1)}, n) << self <<
                 map_signals_circuit({(n - 1): in_port}, n))
@@ -1122,12 +1201,11 @@ class CIdentity(Circuit, Expression, metaclass=Singleton):
         return tuple()
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Circuit):
             return NotImplemented
-
         if self.cdim == other.cdim:
-            if self is other:
-                return True
             try:
                 return self.toSLH() == other.toSLH()
             except CannotConvertToSLH:
@@ -1179,6 +1257,8 @@ class CircuitZero(Circuit, Expression, metaclass=Singleton):
     def __eq__(self, other):
         if self is other:
             return True
+        if not isinstance(other, Circuit):
+            return NotImplemented
         if self.cdim == other.cdim:
             try:
                 return self.toSLH() == other.toSLH()
@@ -1227,6 +1307,9 @@ class SeriesProduct(Circuit, Operation):
     _binary_rules = []  # see end of module
 
     _space = None  # lazily evaluated
+    # instance cache generation in which the series product was found to be
+    # invariant under a double series_inverse, see _series_feedback
+    _si_canonical_generation = None
 
     @singleton_object
     class neutral_element(metaclass=Singleton):
@@ -1298,16 +1381,14 @@ class Concatenation(Circuit, Operation):
         assert not adjoint, "adjoint not defined"
         printer = getattr(self, "_"+fmt+"_printer")
         reduced_operands = []  # reduce consecutive identities to a str
-        id_count = 0
-        for o in self.operands:
-            if o == CIdentity:
-                id_count += 1
+        for is_identity, group in groupby(
+                self.operands, key=lambda o: o is CIdentity):
+            if is_identity:
+                reduced_operands.append(
+                        printer.circuit_identity_fmt.format(
+                            cdim=len(list(group))))
             else:
-                if id_count > 0:
-                    reduced_operands.append(
-                            printer.circuit_identity_fmt.format(cdim=id_count))
-                    id_count = 0
-                reduced_operands.append(o)
+                reduced_operands.extend(group)
         return printer.render_sum(
                 reduced_operands, plus_sym=printer.circuit_concat_sym,
                 adjoint=adjoint)
@@ -1357,6 +1438,7 @@ class Concatenation(Circuit, Operation):
         return Concatenation.create(*[o.series_inverse()
                                       for o in self.operands])
 
+    @_cache_feedback
     def _feedback(self, *, out_port, in_port):
 
         n = self.cdim
@@ -1420,6 +1502,7 @@ class Feedback(Circuit, Operation):
     :type in_port: int
     """
     delegate_to_method = (Concatenation, SLH, CPermutation)
+    _delegate_types = {}  # type -> bool, see _delegates_to_method
 
     _simplifications = [match_replace, ]
 
@@ -1463,7 +1546,10 @@ class Feedback(Circuit, Operation):
             raise ValueError("circuit dimension %d needs to be > 1 in order "
                              "to apply a feedback" % n)
 
-        if isinstance(circuit, cls.delegate_to_method):
+        if out_port == in_port and circuit is circuit_identity(n):
+            return circuit_identity(n - 1)
+
+        if _delegates_to_method(cls, circuit):
             return circuit._feedback(out_port=out_port, in_port=in_port)
 
         return super().create(circuit, out_port=out_port, in_port=in_port)
@@ -1518,6 +1604,7 @@ class SeriesInverse(Circuit, Operation):
     _simplifications = []
     delegate_to_method = (SeriesProduct, Concatenation, Feedback, SLH,
                           CPermutation, CIdentity.__class__)
+    _delegate_types = {}  # type -> bool, see _delegates_to_method
 
     @property
     def operand(self):
@@ -1528,7 +1615,7 @@ class SeriesInverse(Circuit, Operation):
     def create(cls, circuit):
         if isinstance(circuit, SeriesInverse):
             return circuit.operand
-        elif isinstance(circuit, cls.delegate_to_method):
+        elif _delegates_to_method(cls, circuit):
             return circuit._series_inverse()
         return super().create(circuit)
 
@@ -1567,10 +1654,14 @@ class SeriesInverse(Circuit, Operation):
 ###############################################################################
 
 
+@lru_cache(maxsize=None)
 def circuit_identity(n):
     """
     Return the circuit identity for n channels.
 
+    Since circuit expressions are immutable, the identity circuit for a given
+    `n` is constructed only once and then shared.
+
     :param n: The channel dimension
     :type n: int
     :return: n-channel identity circuit
@@ -1580,7 +1671,7 @@ def circuit_identity(n):
         return CircuitZero
     if n == 1:
         return cid_1
-    return Concatenation(*((cid_1,) * n))
+    return Concatenation.create(*((cid_1,) * n))
 
 
 cid = circuit_identity
@@ -1666,6 +1757,13 @@ def get_common_block_structure(lhs_bs, rhs_bs):
     return (lsum, ) + get_common_block_structure(lhs_bs[i:], rhs_bs[j:])
 
 
+@lru_cache(maxsize=None)
+def _identity_permutation(n):
+    """Image tuple ``(0, 1, ..., n-1)`` of the identity permutation of `n`
+    elements"""
+    return tuple(range(n))
+
+
 def extract_signal(k, n):
     """Create a permutation that maps the k-th (zero-based) element to the last
     element, while preserving the relative order of all other elements.
@@ -1677,7 +1775,7 @@ def extract_signal(k, n):
     :return: Permutation image tuple
     :rtype: tuple
     """
-    return tuple(range(k) + [n - 1] + range(k, n - 1))
+    return tuple(list(range(k)) + [n - 1] + list(range(k, n - 1)))
 
 
 def extract_signal_circuit(k, cdim):
@@ -1707,27 +1805,21 @@ def map_signals(mapping, n):
     :rtype: tuple
     :raise: ValueError
     """
-    free_values = list(range(n))
-
-    for v in mapping.values():
+    values = set(mapping.values())
+    if len(values) < len(mapping):
+        raise ValueError('the mapping must not map two keys to the same '
+                         'value')
+    for v in values:
         if v >= n:
             raise ValueError('the mapping cannot take on values larger than '
                              'cdim - 1')
-        free_values.remove(v)
     for k in mapping:
         if k >= n:
             raise ValueError('the mapping cannot map keys larger than '
                              'cdim - 1')
-    # sorted(set(range(n)).difference(set(mapping.values())))
-    permutation = []
-    # print(free_values, mapping, n)
-    for k in range(n):
-        if k in mapping:
-            permutation.append(mapping[k])
-        else:
-            permutation.append(free_values.pop(0))
-    # print(permutation)
-    return tuple(permutation)
+    free_values = iter(sorted(set(range(n)).difference(values)))
+    return tuple(mapping[k] if k in mapping else next(free_values)
+                 for k in range(n))
 
 
 def map_signals_circuit(mapping, n):
@@ -1922,8 +2014,19 @@ def _pull_out_unaffected_blocks_rhs(rest, rhs, out_port, in_port):
 
 def _series_feedback(series, out_port, in_port):
     """Invert a series self-feedback twice to get rid of unnecessary
-    permutations."""
+    permutations.
+
+    The result of the double inversion is marked as canonical, so that the
+    inversion is not repeated when the feedback of that result is created.
+    The mark only holds for the current instance cache generation, as the
+    result of the inversion depends on the active rules.
+    """
+    generation = Expression._instance_cache_generation
+    if series._si_canonical_generation == generation:
+        raise CannotSimplify()
     series_s = series.series_inverse().series_inverse()
+    if isinstance(series_s, SeriesProduct):
+        series_s._si_canonical_generation = generation
     if series_s == series:
         raise CannotSimplify()
     return series_s.feedback(out_port=out_port, in_port=in_port)
@@ -2125,7 +2228,7 @@ def move_drive_to_H(slh, which=[]):
 
 
 def prepare_adiabatic_limit(slh, k=None):
-    """Prepare the adiabatic elimination procedure for an SLH object with
+    r"""Prepare the adiabatic elimination procedure for an SLH object with
     scaling parameter k->\infty
 
     :param slh: The SLH object to take the limit for
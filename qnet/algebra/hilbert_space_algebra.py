@@ -25,11 +25,10 @@ Hilbert spaces of quantum systems.
 For more details see :ref:`hilbert_space_algebra`.
 """
 import re
-import operator
-import functools
 from collections import OrderedDict
+from functools import lru_cache
 from abc import ABCMeta, abstractmethod, abstractproperty
-from itertools import product as cartesian_product
+from itertools import product as cartesian_product, chain
 
 from .abstract_algebra import (
         Expression, Operation, AlgebraError, assoc, idem, filter_neutral,
@@ -65,7 +64,8 @@ def convert_to_spaces(cls, ops, kwargs):
     LocalSpace objects with corresponding labels:
     For a string, just itself, for an int, a string version of that int.
     """
-    cops = [o if isinstance(o, HilbertSpace) else LocalSpace(o) for o in ops]
+    cops = [o if (type(o) in _SPACE_TYPES or isinstance(o, HilbertSpace))
+            else LocalSpace.create(o) for o in ops]
     return cops, kwargs
 
 
@@ -77,6 +77,12 @@ def empty_trivial(cls, ops, kwargs):
         return ops, kwargs
 
 
+@lru_cache(maxsize=1024)
+def _matches_label_pattern(rx_label, label):
+    """Whether `label` matches the compiled regex `rx_label`"""
+    return rx_label.match(label) is not None
+
+
 ###############################################################################
 # Abstract base classes
 ###############################################################################
@@ -84,6 +90,7 @@ def empty_trivial(cls, ops, kwargs):
 
 class HilbertSpace(metaclass=ABCMeta):
     """Basic Hilbert space class from which concrete classes are derived."""
+    __slots__ = ()
 
     def tensor(self, *others):
         """Tensor product between Hilbert spaces
@@ -117,10 +124,11 @@ class HilbertSpace(metaclass=ABCMeta):
         other Hilbert space, while `TrivialSpace` *is* disjoint with any other
         HilbertSpace (even itself)
         """
-        if other == FullSpace:
+        if other is FullSpace:
             return False
         else:
-            return set(self.local_factors).isdisjoint(set(other.local_factors))
+            return self._local_factors_set.isdisjoint(
+                    other._local_factors_set)
 
     def is_tensor_factor_of(self, other):
         """Test if a space is included within a larger tensor product space.
@@ -244,6 +252,8 @@ class LocalSpace(HilbertSpace, Expression):
             from left to right be increasing `order_index`; Hilbert spaces
             without an explicit `order_index` are sorted by their label
     """
+    __slots__ = ('_label', '_basis', '_dimension', '_order_index', '_kwargs',
+                 '_minimal_kwargs', '_order_key_tuple', '_local_factors_set')
     _rx_label = re.compile('^[A-Za-z0-9.+-]+(_[A-Za-z0-9().+-]+)?$')
 
     def __init__(self, label, *, basis=None, dimension=None, order_index=None):
@@ -252,7 +262,7 @@ class LocalSpace(HilbertSpace, Expression):
         if basis is None:
             default_args.append('basis')
         else:
-            basis = tuple([str(label) for label in basis])
+            basis = tuple([str(basis_label) for basis_label in basis])
         if dimension is None:
             default_args.append('dimension')
         else:
@@ -264,7 +274,7 @@ class LocalSpace(HilbertSpace, Expression):
             order_index = int(order_index)
 
         label = str(label)
-        if not self._rx_label.match(label):
+        if not _matches_label_pattern(self._rx_label, label):
             raise ValueError("label '%s' does not match pattern '%s'"
                              % (label, self._rx_label.pattern))
         if basis is None:
@@ -278,7 +288,6 @@ class LocalSpace(HilbertSpace, Expression):
                     raise ValueError("basis and dimension are incompatible")
 
         self._label = label
-        self._order_key = KeyTuple((order_index, label, str(dimension), basis))
         self._basis = basis
         self._dimension = dimension
         self._order_index = order_index
@@ -288,15 +297,41 @@ class LocalSpace(HilbertSpace, Expression):
         self._minimal_kwargs = self._kwargs.copy()
         for key in default_args:
             del self._minimal_kwargs[key]
+        self._order_key_tuple = None  # lazily evaluated, see _order_key
 
         super().__init__(label, basis=basis, dimension=dimension,
                          order_index=order_index)
+        # requires the instance to be hashable, i.e. Expression.__init__
+        self._local_factors_set = frozenset((self, ))
+
+    def __getstate__(self):
+        # _local_factors_set refers back to the instance, which cannot be
+        # hashed before its state is restored; it is rebuilt in __setstate__.
+        # Subclasses without __slots__ may keep further attributes in __dict__
+        state = dict(getattr(self, '__dict__', {}))
+        state.update(
+            (attr, getattr(self, attr))
+            for cls in self.__class__.__mro__
+            for attr in cls.__dict__.get('__slots__', ())
+            if attr != '_local_factors_set')
+        return state
+
+    def __setstate__(self, state):
+        for (attr, val) in state.items():
+            setattr(self, attr, val)
+        self._local_factors_set = frozenset((self, ))
 
     @property
     def args(self):
         """List of arguments, consisting only of `label`"""
         return (self._label, )
 
+    @property
+    @cache_attr('_order_key_tuple')
+    def _order_key(self):
+        return KeyTuple((self._order_index, self._label, str(self._dimension),
+                         self._basis or ()))
+
     @property
     def label(self):
         """Label of the Hilbert space"""
@@ -379,7 +414,7 @@ class LocalSpace(HilbertSpace, Expression):
         return self
 
     def intersect(self, other):
-        if self in other.local_factors:
+        if other is FullSpace or self in other._local_factors_set:
             return self
         return TrivialSpace
 
@@ -388,7 +423,8 @@ class LocalSpace(HilbertSpace, Expression):
         return (self, )
 
     def is_strict_subfactor_of(self, other):
-        if isinstance(other, ProductSpace) and self in other.operands:
+        if (isinstance(other, ProductSpace) and
+                self in other._local_factors_set):
             assert len(other.operands) > 1
             return True
         if other is FullSpace:
@@ -512,6 +548,8 @@ class TrivialSpace(HilbertSpace, Expression, metaclass=Singleton):
         """Empty list (the trivial space has no factors)"""
         return ()
 
+    _local_factors_set = frozenset()
+
     def is_strict_subfactor_of(self, other):
         """The trivial space is a subfactor of any other space (except
         itself)"""
@@ -567,6 +605,10 @@ class FullSpace(HilbertSpace, Expression, metaclass=Singleton):
         undefined"""
         raise AlgebraError("FullSpace has no local_factors")
 
+    @property
+    def _local_factors_set(self):
+        raise AlgebraError("FullSpace has no local_factors")
+
     def intersect(self, other):
         """Return `other`"""
         return other
@@ -609,26 +651,22 @@ class ProductSpace(HilbertSpace, Operation):
     _simplifications = [empty_trivial, assoc, convert_to_spaces, idem,
                         filter_neutral]
 
+    __slots__ = ('_local_factors_set', '_dimension', '_basis',
+                 '_order_key_tuple')
+
     def __init__(self, *local_spaces):
-        if len(set(local_spaces)) != len(local_spaces):
+        self._basis = None  # lazily evaluated, see basis_labels
+        self._order_key_tuple = None  # lazily evaluated, see _order_key
+        self._local_factors_set = frozenset(local_spaces)
+        if len(self._local_factors_set) != len(local_spaces):
             raise ValueError("Nondistinct spaces: %s" % repr(local_spaces))
-        try:
-            self._dimension = functools.reduce(
-                    operator.mul,
-                    [ls.dimension for ls in local_spaces], 1)
-        except BasisNotSetError:
-            self._dimension = None
-        # determine the basis labels automatically
-        try:
-            ls_bases = [ls.basis_labels for ls in local_spaces]
-            basis = []
-            for label_tuple in cartesian_product(*ls_bases):
-                basis.append(",".join([str(l) for l in label_tuple]))
-            self._basis = tuple(basis)
-        except BasisNotSetError:
-            self._basis = None
-        op_keys = [space._order_key for space in local_spaces]
-        self._order_key = KeyTuple([v for op_key in op_keys for v in op_key])
+        dimension = 1
+        for ls in local_spaces:
+            if not ls.has_basis:
+                dimension = None
+                break
+            dimension *= ls.dimension
+        self._dimension = dimension
         super().__init__(*local_spaces)  # Operation __init__
 
     @classmethod
@@ -641,7 +679,7 @@ class ProductSpace(HilbertSpace, Operation):
     def has_basis(self):
         """True if the all the local factors of the `ProductSpace` have a
         defined basis"""
-        return self._basis is not None
+        return self._dimension is not None
 
     @property
     def basis_states(self):
@@ -668,9 +706,15 @@ class ProductSpace(HilbertSpace, Operation):
         Raises:
             BasisNotSetError: if the Hilbert space has no defined basis
         """
-        if self._basis is None:
+        if self._dimension is None:
             raise BasisNotSetError(
                 "Hilbert space %s has no defined basis" % str(self))
+        if self._basis is None:
+            # determine the basis labels only when first requested
+            ls_bases = [tuple(map(str, ls.basis_labels))
+                        for ls in self.local_factors]
+            self._basis = tuple(
+                map(",".join, cartesian_product(*ls_bases)))
         return self._basis
 
     def basis_state(self, index_or_label):
@@ -723,12 +767,8 @@ class ProductSpace(HilbertSpace, Operation):
             return TrivialSpace
         if other is TrivialSpace:
             return self
-        if isinstance(other, ProductSpace):
-            oops = set(other.operands)
-        else:
-            oops = {other}
-        return ProductSpace.create(
-                *sorted(set(self.operands).difference(oops)))
+        return ProductSpace.create(*sorted(
+                self._local_factors_set.difference(other._local_factors_set)))
 
     @property
     def local_factors(self):
@@ -747,18 +787,21 @@ class ProductSpace(HilbertSpace, Operation):
             return self
         if other is TrivialSpace:
             return TrivialSpace
-        if isinstance(other, ProductSpace):
-            other_ops = set(other.operands)
-        else:
-            other_ops = {other}
-        return ProductSpace.create(
-                *sorted(set(self.operands).intersection(other_ops)))
+        return ProductSpace.create(*sorted(
+                self._local_factors_set.intersection(
+                    other._local_factors_set)))
+
+    @property
+    @cache_attr('_order_key_tuple')
+    def _order_key(self):
+        return KeyTuple(chain.from_iterable(
+                space._order_key for space in self.local_factors))
 
     def is_strict_subfactor_of(self, other):
         """Test if a space is included within a larger tensor product space.
         Not ``True`` if ``self == other``."""
         if isinstance(other, ProductSpace):
-            return set(self.operands) < set(other.operands)
+            return self._local_factors_set < other._local_factors_set
         if other is FullSpace:
             return True
         return False
@@ -768,3 +811,9 @@ class ProductSpace(HilbertSpace, Operation):
         printer = getattr(self, "_"+fmt+"_printer")
         return printer.render_product(
                 self.operands, prod_sym=printer.tensor_sym, sum_classes=())
+
+
+# exact types accepted by convert_to_spaces without an isinstance check;
+# subclasses still pass through the isinstance fallback
+_SPACE_TYPES = frozenset(
+        (LocalSpace, ProductSpace, type(TrivialSpace), type(FullSpace)))
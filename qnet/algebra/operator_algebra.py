@@ -88,7 +88,7 @@ def implied_local_space(*, arg_index=None, keys=None):
             new_args = args
         else:
             if isinstance(args[arg_index], (int, str)):
-                hs = LocalSpace(args[arg_index])
+                hs = LocalSpace.create(args[arg_index])
             else:
                 hs = args[arg_index]
                 assert isinstance(hs, HilbertSpace)
@@ -105,7 +105,7 @@ def implied_local_space(*, arg_index=None, keys=None):
             for key, val in kwargs.items():
                 if key in keys:
                     if isinstance(val, (int, str)):
-                        val = LocalSpace(val)
+                        val = LocalSpace.create(val)
                     assert isinstance(val, HilbertSpace)
                 new_kwargs[key] = val
         return args, new_kwargs
@@ -381,7 +381,7 @@ class LocalOperator(Operator, Expression, metaclass=ABCMeta):
 
     def __init__(self, *args, hs, identifier=None):
         if isinstance(hs, (str, int)):
-            hs = LocalSpace(hs)
+            hs = LocalSpace.create(hs)
         assert isinstance(hs, LocalSpace)
         self._hs = hs
         if identifier is not None:
@@ -513,9 +513,9 @@ class OperatorSymbol(Operator, Expression):
                                 LocalOperator._rx_identifier.pattern))
         self.identifier = identifier
         if isinstance(hs, (str, int)):
-            hs = LocalSpace(hs)
+            hs = LocalSpace.create(hs)
         elif isinstance(hs, tuple):
-            hs = ProductSpace.create(*[LocalSpace(h) for h in hs])
+            hs = ProductSpace.create(*[LocalSpace.create(h) for h in hs])
         self._hs = hs
         self._order_key = KeyTuple((self.__class__.__name__, str(identifier),
                                     1.0))
@@ -670,7 +670,7 @@ class Destroy(LocalOperator):
 
 
 class Jz(LocalOperator):
-    """$\Op{J}_z$ is the $z$ component of a general spin operator acting
+    r"""$\Op{J}_z$ is the $z$ component of a general spin operator acting
     on a particular :class:`LocalSpace` `hs` of freedom with well defined spin
     quantum number $s$.  It is Hermitian::
 
@@ -696,7 +696,7 @@ class Jz(LocalOperator):
 
 
 class Jplus(LocalOperator):
-    """ $\Op{J}_{+} = \Op{J}_x + i \op{J}_y$ is the raising ladder operator
+    r""" $\Op{J}_{+} = \Op{J}_x + i \op{J}_y$ is the raising ladder operator
     of a general spin operator acting on a particular :class:`LocalSpace` `hs`
     with well defined spin quantum number $s$.  It's adjoint is the
     lowering operator::
@@ -711,7 +711,7 @@ class Jplus(LocalOperator):
 
 
 class Jminus(LocalOperator):
-    """$\Op{J}_{-} = \Op{J}_x - i \op{J}_y$ is lowering ladder operator of a
+    r"""$\Op{J}_{-} = \Op{J}_x - i \op{J}_y$ is lowering ladder operator of a
     general spin operator acting on a particular :class:`LocalSpace` `hs`
     with well defined spin quantum number $s$.  It's adjoint is the raising
     operator::
@@ -891,7 +891,7 @@ class LocalSigma(LocalOperator):
 
     def __init__(self, j, k, *, hs, identifier=None):
         if isinstance(hs, (str, int)):
-            hs = LocalSpace(hs)
+            hs = LocalSpace.create(hs)
         self.j = j  #: label/index of eigenstate  $\ket{j}$
         self.k = k  #: label/index of eigenstate  $\ket{k}$
         for jk in [j, k]:
@@ -1041,7 +1041,7 @@ class OperatorTimes(OperatorOperation):
     order_key = DisjunctCommutativeHSOrder
 
     def factor_for_space(self, spc):
-        if spc == TrivialSpace:
+        if spc is TrivialSpace:
             ops_on_spc = [o for o in self.operands
                           if o.space is TrivialSpace]
             ops_not_on_spc = [o for o in self.operands
@@ -1328,7 +1328,7 @@ class OperatorTrace(SingleOperatorOperation):
 
     def __init__(self, op, *, over_space):
         if isinstance(over_space, (int, str)):
-            over_space = LocalSpace(over_space)
+            over_space = LocalSpace.create(over_space)
         assert isinstance(over_space, HilbertSpace)
         self._over_space = over_space
         super().__init__(op, over_space=over_space)
@@ -1608,12 +1608,12 @@ def factor_for_trace(ls, op):
                         OperatorTrace.create(OperatorTimes.create(*rest),
                                              over_space=ls))
         raise CannotSimplify()
-    if ls & op.space == TrivialSpace:
+    if ls & op.space is TrivialSpace:
         return ls.dimension * op
     if ls < op.space and isinstance(op, OperatorTimes):
-        pull_out = [o for o in op.operands if (o.space & ls) == TrivialSpace]
+        pull_out = [o for o in op.operands if (o.space & ls) is TrivialSpace]
 
-        rest = [o for o in op.operands if (o.space & ls) != TrivialSpace]
+        rest = [o for o in op.operands if (o.space & ls) is not TrivialSpace]
         if (not isinstance(rest[0], LocalSigma) or
                 not isinstance(rest[-1], LocalSigma)):
             found_ls = False
@@ -56,7 +56,10 @@ def invert_permutation(permutation):
     :return: The inverse permutation tuple
     :rtype: tuple
     """
-    return tuple([permutation.index(p) for p in range(len(permutation))])
+    inverse = [0] * len(permutation)
+    for i, p in enumerate(permutation):
+        inverse[p] = i
+    return tuple(inverse)
 
 
 def permutation_to_disjoint_cycles(permutation):
@@ -312,8 +315,6 @@ def block_perm_and_perms_within_blocks(permutation, block_structure):
     key_block_perm_inv = lambda block_index: images_mins[block_index]
 
     block_perm_inv = tuple(sorted(range(nblocks), key = key_block_perm_inv))
-    # print(images_mins)
-    # print(permutation, block_structure, "-->", block_perm, invert_permutation(block_perm))
     block_perm = invert_permutation(block_perm_inv)
 
     assert images_mins[block_perm_inv[0]] == min(images_mins)
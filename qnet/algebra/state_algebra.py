@@ -188,9 +188,9 @@ class KetSymbol(Ket, Expression):
             raise ValueError("label '%s' does not match pattern '%s'"
                              % (label, self._rx_label.pattern))
         if isinstance(hs, (str, int)):
-            hs = LocalSpace(hs)
+            hs = LocalSpace.create(hs)
         elif isinstance(hs, tuple):
-            hs = ProductSpace.create(*[LocalSpace(h) for h in hs])
+            hs = ProductSpace.create(*[LocalSpace.create(h) for h in hs])
         self._hs = hs
         self._order_key = KeyTuple((self.__class__.__name__, str(label), 1.0))
         super().__init__(label, hs=hs)
@@ -237,7 +237,7 @@ class LocalKet(KetSymbol):
 
     def __init__(self, label, *, hs):
         if isinstance(hs, (str, int)):
-            hs = LocalSpace(hs)
+            hs = LocalSpace.create(hs)
         if not isinstance(hs, LocalSpace):
             raise ValueError("hs must be a LocalSpace")
         super().__init__(label, hs=hs)
@@ -346,7 +346,7 @@ class BasisKet(LocalKet):
     """
     def __init__(self, label_or_index, *, hs):
         if isinstance(hs, (str, int)):
-            hs = LocalSpace(hs)
+            hs = LocalSpace.create(hs)
         if isinstance(label_or_index, str):
             label = label_or_index
             ind = hs.basis_labels.index(label)  # raises BasisNotSetError
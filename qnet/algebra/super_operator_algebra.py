@@ -216,9 +216,9 @@ class SuperOperatorSymbol(SuperOperator, Expression):
                                 % (label, self._rx_label.pattern))
         self._label = label
         if isinstance(hs, (str, int)):
-            hs = LocalSpace(hs)
+            hs = LocalSpace.create(hs)
         elif isinstance(hs, tuple):
-            hs = ProductSpace.create(*[LocalSpace(h) for h in hs])
+            hs = ProductSpace.create(*[LocalSpace.create(h) for h in hs])
         self._hs = hs
         self._order_key = KeyTuple((self.__class__.__name__, str(label),
                                     1.0))
@@ -699,7 +699,7 @@ class SuperOperatorTimesOperator(Operator, Operation):
 
 
 def commutator(A, B = None):
-    """If ``B != None``, return the commutator :math:`[A,B]`, otherwise return
+    r"""If ``B != None``, return the commutator :math:`[A,B]`, otherwise return
     the super-operator :math:`[A,\cdot]`.  The super-operator :math:`[A,\cdot]`
     maps any other operator ``B`` to the commutator :math:`[A, B] = A B - B A`.
 
@@ -713,7 +713,7 @@ def commutator(A, B = None):
     return SPre(A) - SPost(A)
 
 def anti_commutator(A, B = None):
-    """If ``B != None``, return the anti-commutator :math:`\{A,B\}`, otherwise
+    r"""If ``B != None``, return the anti-commutator :math:`\{A,B\}`, otherwise
     return the super-operator :math:`\{A,\cdot\}`.  The super-operator
     :math:`\{A,\cdot\}` maps any other operator ``B`` to the anti-commutator
     :math:`\{A, B\} = A B + B A`.
@@ -728,7 +728,7 @@ def anti_commutator(A, B = None):
     return SPre(A) + SPost(A)
 
 def lindblad(C):
-    """Return ``SPre(C) * SPost(C.adjoint()) - (1/2) *
+    r"""Return ``SPre(C) * SPost(C.adjoint()) - (1/2) *
     santi_commutator(C.adjoint()*C)``.  These are the super-operators
     :math:`\mathcal{D}[C]` that form the collapse terms of a Master-Equation.
     Applied to an operator :math:`X` they yield
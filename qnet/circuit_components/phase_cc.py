@@ -20,6 +20,8 @@
 Component definition file for a coherent field Phasement component.
 See documentation of :py:class:`Phase`.
 """
+from functools import lru_cache
+
 from sympy.core.symbol import symbols
 from sympy import exp, I
 
@@ -44,14 +46,20 @@ class Phase(Component):
     PORTSOUT = ["Out1"]
 
     def _toSLH(self):
-
-        S = Matrix([[exp(I * self.phi)]])
-        L = Matrix([[0]])
-        H = 0
-        return SLH(S, L, H)
+        return _phase_slh(self.phi)
 
     def _toABCD(self, linearize):
         return self.toSLH().toABCD(linearize)
 
     def _creduce(self):
         return self
+
+
+@lru_cache(maxsize=None, typed=True)
+def _phase_slh(phi):
+    """SLH model for a phase shift by `phi`, shared between all
+    :class:`Phase` components with the same phase angle"""
+    S = Matrix([[exp(I * phi)]])
+    L = Matrix([[0]])
+    H = 0
+    return SLH(S, L, H)
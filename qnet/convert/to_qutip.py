@@ -91,7 +91,7 @@ def convert_to_qutip(expr, full_space=None, mapping=None):
     if not expr.space.is_tensor_factor_of(full_space):
         raise ValueError(
             "expr '%s' must be in full_space %s" % (expr, full_space))
-    if full_space == TrivialSpace:
+    if full_space is TrivialSpace:
         raise AlgebraError(
             "Cannot convert object in TrivialSpace to qutip. "
             "You may pass a non-trivial `full_space`")
@@ -187,7 +187,7 @@ def SLH_to_qutip(slh, full_space=None, time_symbol=None,
                                "at least include slh.space = "+str(slh.space))
     else:
         full_space = slh.space
-    if full_space == TrivialSpace:
+    if full_space is TrivialSpace:
         raise AlgebraError(
             "Cannot convert SLH object in TrivialSpace. "
             "You may pass a non-trivial `full_space`")
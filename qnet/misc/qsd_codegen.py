@@ -1357,7 +1357,7 @@ def qsd_run_worker(kwargs, _runner=None):
 
 
 def sanitize_name(name, allowed_letters, replacements):
-    """Return a sanitized `name`, where all letters that occur as keys in
+    r"""Return a sanitized `name`, where all letters that occur as keys in
     `replacements` are replaced by their corresponding values, and any letters
     that do not match `allowed_letters` are dropped
 
@@ -26,10 +26,11 @@ import pytest
 from qnet.algebra.circuit_algebra import (
         SLH, CircuitSymbol, CPermutation, circuit_identity, map_signals,
         SeriesProduct, invert_permutation, Concatenation, P_sigma, cid,
-        map_signals_circuit, FB, getABCD, connect, CIdentity,
-        pad_with_identity, move_drive_to_H)
+        map_signals_circuit, FB, getABCD, connect, CIdentity, CircuitZero,
+        Feedback, pad_with_identity, move_drive_to_H, extract_signal)
 from qnet.algebra.permutations import (
-        permute, full_block_perm, block_perm_and_perms_within_blocks)
+        permute, full_block_perm, block_perm_and_perms_within_blocks,
+        compose_permutations)
 from qnet.algebra.operator_algebra import (
         Operator, OperatorSymbol, sympyOne, Destroy, ZeroOperator)
 from qnet.algebra.matrix_algebra import Matrix, identity_matrix
@@ -72,6 +73,17 @@ def test_circuit_symbol_hashing():
     assert A1 != A2
 
 
+def test_circuit_singleton_equality():
+    """Check that the circuit singletons compare by identity first, and can be
+    compared to non-circuit objects"""
+    assert CIdentity == CIdentity
+    assert CircuitZero == CircuitZero
+    assert CIdentity != CircuitZero
+    assert CircuitZero != OperatorSymbol('A', hs=1)
+    assert CIdentity != OperatorSymbol('A', hs=1)
+    assert Concatenation.create(CIdentity, CIdentity) is cid(2)
+
+
 def test_permutation():
     n = 5
     assert CPermutation.create(()) == circuit_identity(0)
@@ -83,6 +95,22 @@ def test_permutation():
     assert map_signals({0:1,1:0}, 2) == (1,0)
     assert map_signals({0:5,1:0}, 6) == (5,0,1,2,3,4)
     assert map_signals({0:5,1:0, 3:2}, 6) == invert_permutation(map_signals({5:0,0:1, 2:3}, 6))
+    with pytest.raises(ValueError):
+        map_signals({0:1, 1:1}, 3)
+    assert extract_signal(1, 4) == (0, 3, 1, 2)
+    assert extract_signal(3, 4) == (0, 1, 2, 3)
+
+
+def test_series_with_permutation():
+    """Test that composing small and large permutations agrees with
+    compose_permutations"""
+    for n in (3, CPermutation._numpy_min_cdim + 4):
+        alpha = tuple(range(1, n)) + (0, )
+        beta = (n - 1, ) + tuple(range(n - 1))[::-1]
+        composed = CPermutation.create(alpha) << CPermutation.create(beta)
+        assert composed.permutation == compose_permutations(alpha, beta)
+        assert (CPermutation.create(beta) << CPermutation.create(beta) ==
+                cid(n))
 
 
 def test_series():
@@ -101,6 +129,7 @@ def test_series_filter_identities():
     for n in (1, 2, 3, 10):
         A, B = get_symbol(n), get_symbol(n)
         idn = circuit_identity(n)
+        assert circuit_identity(n) is idn
         assert A << idn == A
         assert idn << A == A
         assert SeriesProduct.create(idn, idn, A, idn, idn, B, idn, idn) == A << B
@@ -293,6 +322,16 @@ def test_SLH_elements():
     check(S, L, H)
 
 
+def test_toSLH_cached():
+    """Test that the SLH representation of a circuit is computed only once"""
+    bs = Beamsplitter('bs')
+    circuit = bs << (cid(1) + Phase('phi'))
+    slh = circuit.toSLH()
+    assert isinstance(slh, SLH)
+    assert circuit.toSLH() is slh
+    assert slh.toSLH() is slh
+
+
 def test_feedback():
     A, B, C, D, A1, A2 = get_symbols(3, 2, 1, 1, 1, 1)
     circuit_identity(1)
@@ -307,6 +346,17 @@ def test_feedback():
 
     assert (B + C).feedback(out_port=1, in_port=1) == B.feedback() + C
 
+    # trivial feedback loops
+    assert Feedback.create(cid(3), out_port=2, in_port=2) is cid(2)
+    assert (cid(3).feedback(out_port=0, in_port=2) ==
+            CPermutation.create((1, 0)))
+    perm = CPermutation.create((3, 0, 2, 1))
+    assert (perm.feedback(out_port=2, in_port=2) ==
+            CPermutation.create((2, 0, 1)))
+    assert (perm.feedback(out_port=0, in_port=1) ==
+            CPermutation.create((2, 1, 0)))
+    assert perm._feedbacks[1][(0, 1)] == CPermutation.create((2, 1, 0))
+
     #check that feedback is resolved into series when possible
     b_feedback = B.feedback(out_port=1, in_port=0)
     series_D_C = b_feedback.substitute({B:(C+D)})
@@ -358,6 +408,21 @@ def test_feedback():
     assert sys_fb.expand().simplify_scalar() == fb.expand().simplify_scalar()
 
 
+def test_concatenation_feedback_across_blocks():
+    """Test that a feedback connecting two blocks of a concatenation is
+    reduced to the same normal form as the pairwise series product"""
+    A = CircuitSymbol('A', 1)
+    perm = CPermutation.create((2, 1, 0))
+    assert ((A + perm).feedback(out_port=0, in_port=3) ==
+            A + CPermutation.create((1, 0)))
+    fb_A = CircuitSymbol('A', 2).feedback()
+    assert isinstance(fb_A, Feedback)
+    assert ((fb_A + perm).feedback(out_port=0, in_port=3) ==
+            fb_A + CPermutation.create((1, 0)))
+    assert ((perm + fb_A).feedback(out_port=3, in_port=0) ==
+            CPermutation.create((1, 0)) + fb_A)
+
+
 def test_ABCD():
     a = Destroy(hs=1)
     H = 2 * a.dag() * a
@@ -17,10 +17,14 @@
 #
 ###########################################################################
 
+import pickle
+
 import pytest
 
+from qnet.algebra.abstract_algebra import AlgebraError
 from qnet.algebra.hilbert_space_algebra import (
-        LocalSpace, ProductSpace, TrivialSpace, FullSpace, BasisNotSetError)
+        LocalSpace, ProductSpace, TrivialSpace, FullSpace, BasisNotSetError,
+        _matches_label_pattern)
 from qnet.algebra.operator_algebra import Destroy
 from qnet.algebra.state_algebra import (
         KetSymbol, BasisKet, TensorKet, TrivialKet)
@@ -129,6 +133,32 @@ def test_product_space():
     assert (h1 * h2 * h3) & h1 == h1
     assert h1 * h1 == h1
 
+    # direct instantiation does not filter duplicate factors
+    with pytest.raises(ValueError) as exc_info:
+        ProductSpace(h1, h2, h1)
+    assert "Nondistinct spaces" in str(exc_info.value)
+
+
+def test_local_space_from_label_is_cached():
+    """Test that converting a label to a LocalSpace re-uses the same
+    instance"""
+    h1 = LocalSpace.create("h1")
+    assert ProductSpace.create("h1", "h2").local_factors[0] is h1
+    assert Destroy(hs="h1").space is h1
+    assert BasisKet(0, hs=1).space is LocalSpace.create(1)
+
+
+def test_local_space_label_validation():
+    """Test that invalid labels are rejected, also after a valid label has
+    been seen"""
+    LocalSpace("q_1", dimension=2)
+    assert LocalSpace("q_1").label == "q_1"
+    for label in ("q 1", "q_1_2", ""):
+        with pytest.raises(ValueError) as exc_info:
+            LocalSpace(label)
+        assert "does not match pattern" in str(exc_info.value)
+    assert _matches_label_pattern.cache_info().maxsize is not None
+
 
 def test_dimension():
     h1 = LocalSpace("h1", dimension = 10)
@@ -141,6 +171,14 @@ def test_dimension():
         h3.dimension
     assert h4.dimension == 100
 
+    big = ProductSpace(*[LocalSpace(i, dimension=10) for i in range(12)])
+    assert big.has_basis
+    assert big.dimension == 10**12
+    assert (h1*h2).basis_labels[21] == '1,1'
+    assert not (h1*h3).has_basis
+    with pytest.raises(BasisNotSetError):
+        (h1*h3).basis_labels
+
 
 def test_space_ordering():
     h1 = LocalSpace("h1")
@@ -171,6 +209,57 @@ def test_operations():
     assert h12 & h13 == h1
     assert (h12 / h13) * (h13 & h12) == h12
     assert h1 & h12 == h1
+    assert h1 & FullSpace == h1
+    assert h12.isdisjoint(h3)
+    assert not h12.isdisjoint(h23)
+    assert not h12.isdisjoint(FullSpace)
+    assert TrivialSpace.isdisjoint(h1)
+    assert h1.isdisjoint(h2)
+    assert not h1.isdisjoint(h1)
+    with pytest.raises(AlgebraError):
+        FullSpace.isdisjoint(h1)
+    assert h12 < h123
+
+
+def test_pickle_spaces():
+    """Test that Hilbert spaces survive a pickle round trip"""
+    h1 = LocalSpace("h1", dimension=2)
+    h12 = h1 * LocalSpace("h2")
+    h1_copy = pickle.loads(pickle.dumps(h1))
+    assert h1_copy == h1
+    assert h1_copy._local_factors_set == frozenset((h1, ))
+    h12_copy = pickle.loads(pickle.dumps(h12))
+    assert h12_copy == h12
+    assert h12_copy / h1 == LocalSpace("h2")
+
+
+class TaggedLocalSpace(LocalSpace):
+    """LocalSpace subclass that keeps an extra attribute in its __dict__"""
+
+    def __init__(self, label, *, tag=None, **kwargs):
+        super().__init__(label, **kwargs)
+        self.tag = tag
+
+
+def test_pickle_local_space_subclass():
+    """Test that a pickle round trip of a LocalSpace subclass preserves the
+    attributes in the instance __dict__"""
+    h1 = TaggedLocalSpace("h1", dimension=2, tag='qubit')
+    h1_copy = pickle.loads(pickle.dumps(h1))
+    assert isinstance(h1_copy, TaggedLocalSpace)
+    assert h1_copy == h1
+    assert h1_copy.tag == 'qubit'
+    assert h1_copy.dimension == 2
+    assert h1_copy._local_factors_set == frozenset((h1, ))
+
+
+def test_spaces_use_slots():
+    """Test that local and product spaces do not carry an instance dict"""
+    h1 = LocalSpace("h1", dimension=2)
+    h12 = h1 * LocalSpace("h2", dimension=2)
+    assert not hasattr(h1, '__dict__')
+    assert not hasattr(h12, '__dict__')
+    assert h12.basis_labels[-1] == '1,1'
 
 
 def test_hs_basis_states():
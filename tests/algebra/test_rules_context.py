@@ -23,8 +23,13 @@ from qnet.algebra.hilbert_space_algebra import LocalSpace
 from qnet.algebra.operator_algebra import (
     OperatorSymbol, ScalarTimesOperator, OperatorPlus, Operator,
     IdentityOperator, OperatorTimes)
+from qnet.algebra.circuit_algebra import (
+    CircuitSymbol, CPermutation, SeriesProduct, Feedback, Concatenation,
+    CIdentity, cid)
+from qnet.circuit_components.beamsplitter_cc import Beamsplitter
+from qnet.circuit_components.displace_cc import Displace
 from qnet.algebra.abstract_algebra import (
-    no_rules, extra_rules, extra_binary_rules)
+    no_rules, extra_rules, extra_binary_rules, _select_rules)
 from qnet.algebra.pattern_matching import wc, pattern_head, pattern
 from qnet.printing import srepr
 
@@ -103,3 +108,125 @@ def test_extra_binary_rules():
     with pytest.raises(AttributeError):
         with extra_rules(OperatorPlus, [rule, ]):
             expr = 2 * (a * b - b * a + IdentityOperator)
+
+
+def test_rules_context_feedback_cache():
+    """Test that a feedback computed with temporary rules is not re-used
+    after leaving the managed context, and vice versa"""
+    A = CircuitSymbol('A', cdim=2)
+    B = CircuitSymbol('B', cdim=1)
+    Z = CircuitSymbol('Z', cdim=2)
+    circuit = A + B
+    P_ = wc('P', head=CPermutation)
+    X_ = wc('X', head=CircuitSymbol)
+    rule = (pattern_head(P_, X_), lambda P, X: Z)
+    expected = (cid(1) + B) << CPermutation.create((1, 0)) << A
+    assert circuit.feedback(out_port=0, in_port=2) == expected
+    with extra_binary_rules(SeriesProduct, [rule, ]):
+        assert circuit.feedback(out_port=0, in_port=2) == (cid(1) + B) << Z
+    assert circuit.feedback(out_port=0, in_port=2) == expected
+
+
+def test_rules_context_slh_cache():
+    """Test that an SLH representation computed while rules are disabled is
+    not re-used after leaving the managed context"""
+    circuit = Beamsplitter('bs') << (Displace('W1', alpha=1) +
+                                     Displace('W2', alpha=1))
+    with no_rules(OperatorPlus), no_rules(ScalarTimesOperator):
+        slh_inside = circuit.toSLH()
+    slh_outside = circuit.toSLH()
+    assert slh_outside is not slh_inside
+    assert slh_outside != slh_inside
+    assert circuit.toSLH() is slh_outside
+
+
+def _selected_rules(cls, attr, ops):
+    """List of (pattern, replacement) tuples selected by `_select_rules`"""
+    return [rule[:2] for rule in _select_rules(cls, attr, ops)]
+
+
+def test_binary_rules_index():
+    """Test that the per-type selection of binary rules is consistent with
+    the rules context managers"""
+    h1 = LocalSpace("h1")
+    a = OperatorSymbol("a", hs=h1)
+    b = OperatorSymbol("b", hs=h1)
+    rules = _selected_rules(OperatorPlus, '_binary_rules', (a, 2 * a))
+    assert len(rules) == 2
+    assert all(rule in OperatorPlus._binary_rules for rule in rules)
+    assert len(_selected_rules(OperatorPlus, '_binary_rules', (a, b))) == 1
+    rule = (pattern_head(a, b), lambda: IdentityOperator)
+    with extra_binary_rules(OperatorPlus, [rule, ]):
+        assert rule in _selected_rules(OperatorPlus, '_binary_rules', (a, b))
+        assert a + b == IdentityOperator
+    assert rule not in _selected_rules(OperatorPlus, '_binary_rules', (a, b))
+    with no_rules(OperatorPlus):
+        assert len(_selected_rules(OperatorPlus, '_binary_rules', (a, a))) == 0
+        assert a + a == OperatorPlus(a, a)
+    assert a + a == 2 * a
+
+
+def test_rules_index_nested():
+    """Test that rules are selected based on the first and last operand of
+    nested patterns"""
+    A = CircuitSymbol('A', cdim=2)
+    B = CircuitSymbol('B', cdim=2)
+    perm = CPermutation.create((1, 0))
+    series = SeriesProduct.create(perm, A, B)
+    rules = _selected_rules(Feedback, '_rules', (series, ))
+    assert rules == Feedback._rules[:2]
+    assert len(_selected_rules(Feedback, '_rules', (A, ))) == 0
+
+
+def test_feedback_rules_dispatch():
+    """Test that the Feedback rules for pulling out permutations and
+    concatenations are selected by the head of the first and last operand of
+    the series product"""
+    A = CircuitSymbol('A', cdim=2)
+    B = CircuitSymbol('B', cdim=1)
+    C = CircuitSymbol('C', cdim=1)
+    perm = CPermutation.create((1, 0))
+    concat = Concatenation.create(B, C)
+    rules = Feedback._rules
+    for (operands, expected) in [
+            ((A, perm), [rules[0], rules[3]]),
+            ((concat, A), [rules[0], rules[2]]),
+            ((A, concat), [rules[0], rules[4]]),
+            ((A, A), [rules[0]])]:
+        series = SeriesProduct.create(*operands)
+        assert _selected_rules(Feedback, '_rules', (series, )) == expected
+
+
+def test_rules_index_wildcard_binding():
+    """Test that rules consisting only of plain wildcards are marked for
+    binding the operands directly"""
+    perm1 = CPermutation.create((1, 0, 2))
+    perm2 = CPermutation.create((0, 2, 1))
+    rules = _select_rules(SeriesProduct, '_binary_rules', (perm1, perm2))
+    (pattern, replacement, wc_names) = rules[0]
+    assert (pattern, replacement) == SeriesProduct._binary_rules[0]
+    assert wc_names == ('A', 'B')
+    assert perm1 << perm2 == perm1.series_with_permutation(perm2)
+    h1 = LocalSpace("h1")
+    a = OperatorSymbol("a", hs=h1)
+    for (pattern, replacement, wc_names) in _select_rules(
+            OperatorPlus, '_binary_rules', (a, a)):
+        assert wc_names is None  # pattern_head(A, A) needs a real match
+
+
+def test_concatenation_rules_index():
+    """Test that only a few of the Concatenation rules are tried for typical
+    pairs of operands"""
+    A = CircuitSymbol('A', cdim=2)
+    B = CircuitSymbol('B', cdim=2)
+    perm = CPermutation.create((1, 0))
+    series = SeriesProduct.create(A, perm)
+    assert len(Concatenation._binary_rules) == 8
+    assert _selected_rules(Concatenation, '_binary_rules', (A, B)) == []
+    assert (_selected_rules(Concatenation, '_binary_rules', (perm, CIdentity))
+            == [Concatenation._binary_rules[3]])
+    assert (_selected_rules(Concatenation, '_binary_rules', (series, A)) ==
+            [Concatenation._binary_rules[6]])
+    assert (_selected_rules(Concatenation, '_binary_rules', (A, series)) ==
+            [Concatenation._binary_rules[7]])
+    assert series + A == (A + A) << (perm + cid(2))
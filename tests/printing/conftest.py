@@ -0,0 +1,31 @@
+# This file is part of QNET.
+#
+#    QNET is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#    QNET is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with QNET.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Copyright (C) 2012-2017, QNET authors (see AUTHORS file)
+#
+###########################################################################
+
+import pytest
+
+from qnet.algebra.circuit_algebra import CircuitSymbol
+from qnet.printing import unicode
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_unicode_printer():
+    """Render a trivial expression once before any of the printing tests run,
+    so that the one-time setup of the printers is not attributed to whichever
+    test happens to print first"""
+    unicode(CircuitSymbol("warm", cdim=1))
@@ -23,7 +23,7 @@ from sympy import symbols, sqrt, exp, I
 
 from qnet.algebra.circuit_algebra import(
         CircuitSymbol, CIdentity, CircuitZero, CPermutation, SeriesProduct,
-        Feedback, SeriesInverse)
+        Feedback, SeriesInverse, cid)
 from qnet.algebra.operator_algebra import(
         OperatorSymbol, IdentityOperator, ZeroOperator, Create, Destroy, Jz,
         Jplus, Jminus, Phase, Displace, Squeeze, LocalSigma, tr, Adjoint,
@@ -72,6 +72,8 @@ def test_ascii_circuit_operations():
     assert (ascii(Feedback((A+B), out_port=3, in_port=0)) ==
             "[A_test + B_test]_{3->0}")
     assert ascii(SeriesInverse(A+B)) == "[A_test + B_test]^{-1}"
+    assert ascii(A + cid(2)) == "A_test + cid(2)"
+    assert ascii(cid(1) + A + cid(1)) == "cid(1) + A_test + cid(1)"
 
 
 def test_ascii_hilbert_elements():
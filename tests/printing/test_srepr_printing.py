@@ -57,6 +57,16 @@ def test_srepr_circuit_elements():
             r'CircuitZero')
 
 
+def test_srepr_local_space_kwargs_order():
+    """Test that the keyword arguments of a LocalSpace are rendered in the
+    order of its signature, leaving out defaults"""
+    hs = LocalSpace('q', basis=('g', 'e'), order_index=2)
+    assert srepr(hs) == "LocalSpace('q', basis=('g', 'e'), order_index=2)"
+    hs = LocalSpace('q', dimension=3, order_index=1)
+    assert srepr(hs) == "LocalSpace('q', dimension=3, order_index=1)"
+    assert list(hs.kwargs) == ['basis', 'dimension', 'order_index']
+
+
 def test_foreign_srepr():
     """Test that srepr also works on sympy/numpy components"""
     A = OperatorSymbol("A", hs=1)
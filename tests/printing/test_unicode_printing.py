@@ -17,6 +17,8 @@
 #
 ###########################################################################
 
+from types import SimpleNamespace
+
 import pytest
 
 from sympy import symbols, sqrt, exp, I, Rational
@@ -41,14 +43,103 @@ from qnet.algebra.super_operator_algebra import (
 from qnet.printing import unicode
 
 
-def test_unicode_circuit_elements():
+GAMMA = symbols('gamma', positive=True)
+PHASE = exp(-I * GAMMA)
+
+# depending on the sympy version, sqrt(GAMMA) renders as either 'sqrt(γ)' or
+# '√γ'; these are the acceptable renderings of the expressions involving it
+SQRT_GAMMA_OP_VARIANTS = frozenset([
+    '2 * A\u0302^(q\u2081) - \u221a\u03b3 * (B\u0302^(q\u2081) '
+    '+ C\u0302^(q\u2082))',
+    '2 * A\u0302^(q\u2081) - sqrt(\u03b3) * (B\u0302^(q\u2081) '
+    '+ C\u0302^(q\u2082))'])
+#   2 * Â^(q₁) - √γ * (B̂^(q₁) + Ĉ^(q₂))
+SQRT_GAMMA_SOP_VARIANTS = frozenset([
+    '2 * A^(q₁) - sqrt(γ) * (B^(q₁) + C^(q₂))',
+    '2 * A^(q₁) - √γ * (B^(q₁) + C^(q₂))'])
+SQRT_GAMMA_SOP_TIMES_OP_VARIANTS = frozenset([
+    'L\u207d\xb9\u207e[\u221a\u03b3 * A\u0302\u207d\xb9\u207e]',
+    'L\u207d\xb9\u207e[sqrt(\u03b3) * A\u0302\u207d\xb9\u207e]'])
+#   L⁽¹⁾[√γ * Â⁽¹⁾]
+
+
+@pytest.fixture(scope="module")
+def hs1():
+    """Two-level Hilbert space 'q_1' with basis labels, for the ket tests"""
+    return LocalSpace('q_1', basis=('g', 'e'))
+
+
+@pytest.fixture(scope="module")
+def hs2():
+    """Two-level Hilbert space 'q_2' with basis labels, for the ket tests"""
+    return LocalSpace('q_2', basis=('g', 'e'))
+
+
+@pytest.fixture(scope="module")
+def hs1_dim2():
+    """Hilbert space 'q_1' with only a dimension (no basis labels)"""
+    return LocalSpace('q_1', dimension=2)
+
+
+@pytest.fixture(scope="module")
+def hs2_dim2():
+    """Hilbert space 'q_2' with only a dimension (no basis labels)"""
+    return LocalSpace('q_2', dimension=2)
+
+
+@pytest.fixture(scope="module")
+def ket_g1(hs1):
+    return BasisKet('g', hs=hs1)
+
+
+@pytest.fixture(scope="module")
+def ket_e1(hs1):
+    return BasisKet('e', hs=hs1)
+
+
+@pytest.fixture(scope="module")
+def ket_g2(hs2):
+    return BasisKet('g', hs=hs2)
+
+
+@pytest.fixture(scope="module")
+def ket_e2(hs2):
+    return BasisKet('e', hs=hs2)
+
+
+@pytest.fixture(scope="module")
+def bell_states(ket_g1, ket_e1, ket_g2, ket_e2):
+    """Two Bell states on 'q_1' and 'q_2', and their inner and outer product.
+    Building these involves sympy simplification of the 1/sqrt(2)
+    prefactors, so they are only built once."""
+    bell1 = (ket_e1 * ket_g2 - I * ket_g1 * ket_e2) / sqrt(2)
+    bell2 = (ket_e1 * ket_e2 - ket_g1 * ket_g2) / sqrt(2)
+    return SimpleNamespace(
+        bell1=bell1, bell2=bell2, braket=BraKet.create(bell1, bell2),
+        ketbra=KetBra.create(bell1, bell2))
+
+
+@pytest.fixture(scope="module")
+def psi1(hs1):
+    return KetSymbol("Psi_1", hs=hs1)
+
+
+@pytest.fixture(scope="module")
+def phi(hs2):
+    return KetSymbol("Phi", hs=hs2)
+
+
+@pytest.mark.parametrize('expr, expected', [
+    (CircuitSymbol("C", cdim=2), 'C'),
+    (CircuitSymbol("C_1", cdim=2), 'C₁'),
+    (CircuitSymbol("Xi_2", 2), 'Ξ₂'),
+    (CircuitSymbol("Xi_full", 2), 'Ξ_full'),
+    (CIdentity, 'cid(1)'),
+    (CircuitZero, 'cid(0)'),
+])
+def test_unicode_circuit_elements(expr, expected):
     """Test the unicode representation of "atomic" circuit algebra elements"""
-    assert unicode(CircuitSymbol("C", cdim=2)) == 'C'
-    assert unicode(CircuitSymbol("C_1", cdim=2)) == 'C₁'
-    assert unicode(CircuitSymbol("Xi_2", 2)) == 'Ξ₂'
-    assert unicode(CircuitSymbol("Xi_full", 2)) == 'Ξ_full'
-    assert unicode(CIdentity) == 'cid(1)'
-    assert unicode(CircuitZero) == 'cid(0)'
+    assert unicode(expr) == expected
 
 
 def test_unicode_circuit_operations():
@@ -72,16 +163,19 @@ def test_unicode_circuit_operations():
     assert unicode(SeriesInverse(A+B)) == "[A_test ⊞ B_test]^{-1}"
 
 
-def test_unicode_hilbert_elements():
+@pytest.mark.parametrize('expr, expected', [
+    (LocalSpace(1), 'ℌ₁'),
+    (LocalSpace(1, dimension=2), 'ℌ₁'),
+    (LocalSpace(1, basis=('g', 'e')), 'ℌ₁'),
+    (LocalSpace('local'), 'ℌ_local'),
+    (LocalSpace('kappa'), 'ℌ_κ'),
+    (TrivialSpace, 'ℌ_null'),
+    (FullSpace, 'ℌ_total'),
+])
+def test_unicode_hilbert_elements(expr, expected):
     """Test the unicode representation of "atomic" Hilbert space algebra
     elements"""
-    assert unicode(LocalSpace(1)) == 'ℌ₁'
-    assert unicode(LocalSpace(1, dimension=2)) == 'ℌ₁'
-    assert unicode(LocalSpace(1, basis=('g', 'e'))) == 'ℌ₁'
-    assert unicode(LocalSpace('local')) == 'ℌ_local'
-    assert unicode(LocalSpace('kappa')) == 'ℌ_κ'
-    assert unicode(TrivialSpace) == 'ℌ_null'
-    assert unicode(FullSpace) == 'ℌ_total'
+    assert unicode(expr) == expected
 
 
 def test_unicode_hilbert_operations():
@@ -91,23 +185,32 @@ def test_unicode_hilbert_operations():
     assert unicode(H1 * H2) == 'ℌ₁ ⊗ ℌ₂'
 
 
-def test_unicode_matrix():
-    """Test unicode representation of the Matrix class"""
+def matrix_exprs():
+    """Prepare a list of Matrix expressions and their expected unicode
+    representation"""
     A = OperatorSymbol("A", hs=1)
     B = OperatorSymbol("B", hs=1)
     C = OperatorSymbol("C", hs=1)
     D = OperatorSymbol("D", hs=1)
-    assert (unicode(Matrix([[A, B], [C, D]])) ==
-            '[[A\u0302\u207d\xb9\u207e, B\u0302\u207d\xb9\u207e], '
-            '[C\u0302\u207d\xb9\u207e, D\u0302\u207d\xb9\u207e]]')
-            #  '[[Â⁽¹⁾, B̂⁽¹⁾], [Ĉ⁽¹⁾, D̂⁽¹⁾]]')
-    assert (unicode(Matrix([A, B, C, D])) ==
-            '[[A\u0302\u207d\xb9\u207e], [B\u0302\u207d\xb9\u207e], '
-            '[C\u0302\u207d\xb9\u207e], [D\u0302\u207d\xb9\u207e]]')
-            #  '[Â⁽¹⁾], [B̂⁽¹⁾], [Ĉ⁽¹⁾], [D̂⁽¹⁾]]')
-    assert unicode(Matrix([[0, 1], [-1, 0]])) == '[[0, 1], [-1, 0]]'
-    assert unicode(Matrix([[], []])) == '[[], []]'
-    assert unicode(Matrix([])) == '[[], []]'
+    return [
+        (Matrix([[A, B], [C, D]]),
+         '[[A\u0302\u207d\xb9\u207e, B\u0302\u207d\xb9\u207e], '
+         '[C\u0302\u207d\xb9\u207e, D\u0302\u207d\xb9\u207e]]'),
+        #  '[[Â⁽¹⁾, B̂⁽¹⁾], [Ĉ⁽¹⁾, D̂⁽¹⁾]]'
+        (Matrix([A, B, C, D]),
+         '[[A\u0302\u207d\xb9\u207e], [B\u0302\u207d\xb9\u207e], '
+         '[C\u0302\u207d\xb9\u207e], [D\u0302\u207d\xb9\u207e]]'),
+        #  '[Â⁽¹⁾], [B̂⁽¹⁾], [Ĉ⁽¹⁾], [D̂⁽¹⁾]]'
+        (Matrix([[0, 1], [-1, 0]]), '[[0, 1], [-1, 0]]'),
+        (Matrix([[], []]), '[[], []]'),
+        (Matrix([]), '[[], []]'),
+    ]
+
+
+@pytest.mark.parametrize('expr, expected', matrix_exprs())
+def test_unicode_matrix(expr, expected):
+    """Test unicode representation of the Matrix class"""
+    assert unicode(expr) == expected
 
 
 def test_unicode_operator_elements():
@@ -134,14 +237,11 @@ def test_unicode_operator_elements():
             '\u03a0\u0302\u2091\u207d\xb9\u207e')  # Π̂ₑ⁽¹⁾
 
 
-def test_unicode_operator_operations():
+def test_unicode_operator_operations(hs1_dim2, hs2_dim2):
     """Test the unicode representation of operator algebra operations"""
-    hs1 = LocalSpace('q_1', dimension=2)
-    hs2 = LocalSpace('q_2', dimension=2)
-    A = OperatorSymbol("A", hs=hs1)
-    B = OperatorSymbol("B", hs=hs1)
-    C = OperatorSymbol("C", hs=hs2)
-    gamma = symbols('gamma', positive=True)
+    A = OperatorSymbol("A", hs=hs1_dim2)
+    B = OperatorSymbol("B", hs=hs1_dim2)
+    C = OperatorSymbol("C", hs=hs2_dim2)
     assert unicode(A + B) == 'A\u0302^(q\u2081) + B\u0302^(q\u2081)'
     #                         Â^(q₁) + B̂^(q₁)
     assert unicode(A * B) == 'A\u0302^(q\u2081) B\u0302^(q\u2081)'
@@ -153,11 +253,11 @@ def test_unicode_operator_operations():
     #                          2j * Â^(q₁)
     assert unicode((1+2j) * A) == '(1+2j) * A\u0302^(q\u2081)'
     #                              (1+2j) * Â^(q₁)
-    assert unicode(gamma**2 * A) == '\u03b3**2 * A\u0302^(q\u2081)'
+    assert unicode(GAMMA**2 * A) == '\u03b3**2 * A\u0302^(q\u2081)'
     #                                γ**2 * Â^(q₁)
-    assert unicode(-gamma**2/2 * A) == '-\u03b3**2/2 * A\u0302^(q\u2081)'
+    assert unicode(-GAMMA**2/2 * A) == '-\u03b3**2/2 * A\u0302^(q\u2081)'
     #                                   -γ**2/2 * Â^(q₁)
-    assert (unicode(tr(A * C, over_space=hs2)) ==
+    assert (unicode(tr(A * C, over_space=hs2_dim2)) ==
             'tr_(q\u2082)[C\u0302^(q\u2082)] \u2297 A\u0302^(q\u2081)')
     #       tr_(q₂)[Ĉ^(q₂)] ⊗ Â^(q₁)
     assert unicode(Adjoint(A)) == 'A\u0302^(q\u2081)\u2020'
@@ -170,12 +270,8 @@ def test_unicode_operator_operations():
     #                                         P̂_Ker(Â^(q₁))
     assert unicode(A - B) == 'A\u0302^(q\u2081) - B\u0302^(q\u2081)'
     #                         Â^(q₁) - B̂^(q₁)
-    assert (unicode(2 * A - sqrt(gamma) * (B + C)) in [
-            '2 * A\u0302^(q\u2081) - \u221a\u03b3 * (B\u0302^(q\u2081) '
-            '+ C\u0302^(q\u2082))',
-            '2 * A\u0302^(q\u2081) - sqrt(\u03b3) * (B\u0302^(q\u2081) '
-            '+ C\u0302^(q\u2082))'])
-    #       2 * Â^(q₁) - √γ * (B̂^(q₁) + Ĉ^(q₂))
+    assert (unicode(2 * A - sqrt(GAMMA) * (B + C)) in
+            SQRT_GAMMA_OP_VARIANTS)
     assert (unicode(Commutator(A, B)) ==
             '[A\u0302^(q\u2081), B\u0302^(q\u2081)]')
     #       [Â^(q₁), B̂^(q₁)]
@@ -209,28 +305,17 @@ def test_unicode_bra_elements():
     assert unicode(CoherentStateKet(2.0, hs=1).dag) == '⟨α=2.0|₍₁₎'
 
 
-def test_unicode_ket_operations():
+def test_unicode_ket_operations(
+        hs1, hs2, ket_g1, ket_e1, psi1, phi, bell_states):
     """Test the unicode representation of ket operations"""
-    hs1 = LocalSpace('q_1', basis=('g', 'e'))
-    hs2 = LocalSpace('q_2', basis=('g', 'e'))
-    ket_g1 = BasisKet('g', hs=hs1)
-    ket_e1 = BasisKet('e', hs=hs1)
-    ket_g2 = BasisKet('g', hs=hs2)
-    ket_e2 = BasisKet('e', hs=hs2)
-    psi1 = KetSymbol("Psi_1", hs=hs1)
     psi1_l = LocalKet("Psi_1", hs=hs1)
     psi2 = KetSymbol("Psi_2", hs=hs1)
-    psi2 = KetSymbol("Psi_2", hs=hs1)
-    psi3 = KetSymbol("Psi_3", hs=hs1)
-    phi = KetSymbol("Phi", hs=hs2)
     phi_l = LocalKet("Phi", hs=hs2)
     A = OperatorSymbol("A_0", hs=hs1)
-    gamma = symbols('gamma', positive=True)
-    phase = exp(-I * gamma)
     assert unicode(psi1 + psi2) == '|Ψ₁⟩_(q₁) + |Ψ₂⟩_(q₁)'
     assert unicode(psi1 * phi) == '|Ψ₁⟩_(q₁) ⊗ |Φ⟩_(q₂)'
     assert unicode(psi1_l * phi_l) == '|Ψ₁,Φ⟩_(q₁⊗q₂)'
-    assert unicode(phase * psi1) == 'exp(-I*γ) * |Ψ₁⟩_(q₁)'
+    assert unicode(PHASE * psi1) == 'exp(-I*γ) * |Ψ₁⟩_(q₁)'
     assert (unicode(A * psi1) ==
             'A\u0302_0^(q\u2081) |\u03a8\u2081\u27e9_(q\u2081)')
     #        Â_0^(q₁) |Ψ₁⟩_(q₁)
@@ -238,67 +323,57 @@ def test_unicode_ket_operations():
     assert unicode(ket_e1.dag * ket_e1) == '1'
     assert unicode(ket_g1.dag * ket_e1) == '0'
     assert unicode(KetBra(psi1, psi2)) == '|Ψ₁⟩⟨Ψ₂|_(q₁)'
-    bell1 = (ket_e1 * ket_g2 - I * ket_g1 * ket_e2) / sqrt(2)
-    bell2 = (ket_e1 * ket_e2 - ket_g1 * ket_g2) / sqrt(2)
-    assert (unicode(bell1) ==
+    assert (unicode(bell_states.bell1) ==
             'sqrt(2)/2 * (|e,g⟩_(q₁⊗q₂) - ⅈ * |g,e⟩_(q₁⊗q₂))')
-    assert (unicode(BraKet.create(bell1, bell2)) ==
+    assert (unicode(bell_states.braket) ==
             r'1/2 * (⟨e,g|_(q₁⊗q₂) + ⅈ * ⟨g,e|_(q₁⊗q₂))*(|e,e⟩_(q₁⊗q₂) - '
             r'|g,g⟩_(q₁⊗q₂))')
-    assert (unicode(KetBra.create(bell1, bell2)) ==
+    assert (unicode(bell_states.ketbra) ==
             r'1/2 * (|e,g⟩_(q₁⊗q₂) - ⅈ * |g,e⟩_(q₁⊗q₂))(⟨e,e|_(q₁⊗q₂) - '
             r'⟨g,g|_(q₁⊗q₂))')
 
 
-def test_unicode_bra_operations():
+def test_unicode_bra_operations(hs1_dim2, hs2_dim2):
     """Test the unicode representation of bra operations"""
-    hs1 = LocalSpace('q_1', dimension=2)
-    hs2 = LocalSpace('q_2', dimension=2)
-    psi1 = KetSymbol("Psi_1", hs=hs1)
-    psi2 = KetSymbol("Psi_2", hs=hs1)
-    psi2 = KetSymbol("Psi_2", hs=hs1)
-    phi = KetSymbol("Phi", hs=hs2)
-    bra_psi1_l = LocalKet("Psi_1", hs=hs1).dag
-    bra_phi_l = LocalKet("Phi", hs=hs2).dag
-    gamma = symbols('gamma', positive=True)
-    phase = exp(-I * gamma)
+    psi1 = KetSymbol("Psi_1", hs=hs1_dim2)
+    psi2 = KetSymbol("Psi_2", hs=hs1_dim2)
+    phi = KetSymbol("Phi", hs=hs2_dim2)
+    bra_psi1_l = LocalKet("Psi_1", hs=hs1_dim2).dag
+    bra_phi_l = LocalKet("Phi", hs=hs2_dim2).dag
     assert unicode((psi1 + psi2).dag) == '⟨Ψ₁|_(q₁) + ⟨Ψ₂|_(q₁)'
     assert unicode((psi1 * phi).dag) == '⟨Ψ₁|_(q₁) ⊗ ⟨Φ|_(q₂)'
     assert unicode(bra_psi1_l * bra_phi_l) == '⟨Ψ₁,Φ|_(q₁⊗q₂)'
-    assert unicode(Bra(phase * psi1)) == 'exp(I*γ) * ⟨Ψ₁|_(q₁)'
+    assert unicode(Bra(PHASE * psi1)) == 'exp(I*γ) * ⟨Ψ₁|_(q₁)'
 
 
-def test_unicode_sop_elements():
+@pytest.mark.parametrize('expr, expected', [
+    (SuperOperatorSymbol("A", hs=LocalSpace('q1', dimension=2)), 'A^(q₁)'),
+    (SuperOperatorSymbol("Xi_2", hs=('q1', 'q2')), 'Ξ_2^(q₁⊗q₂)'),
+    (IdentitySuperOperator, "𝟙"),
+    (ZeroSuperOperator, "0"),
+])
+def test_unicode_sop_elements(expr, expected):
     """Test the unicode representation of "atomic" Superoperators"""
-    hs1 = LocalSpace('q1', dimension=2)
-    assert unicode(SuperOperatorSymbol("A", hs=hs1)) == 'A^(q₁)'
-    assert (unicode(SuperOperatorSymbol("Xi_2", hs=('q1', 'q2'))) ==
-            'Ξ_2^(q₁⊗q₂)')
-    assert unicode(IdentitySuperOperator) == "𝟙"
-    assert unicode(ZeroSuperOperator) == "0"
+    assert unicode(expr) == expected
 
 
-def test_unicode_sop_operations():
+def test_unicode_sop_operations(hs1_dim2, hs2_dim2):
     """Test the unicode representation of super operator algebra operations"""
-    hs1 = LocalSpace('q_1', dimension=2)
-    hs2 = LocalSpace('q_2', dimension=2)
-    A = SuperOperatorSymbol("A", hs=hs1)
-    B = SuperOperatorSymbol("B", hs=hs1)
-    C = SuperOperatorSymbol("C", hs=hs2)
+    A = SuperOperatorSymbol("A", hs=hs1_dim2)
+    B = SuperOperatorSymbol("B", hs=hs1_dim2)
+    C = SuperOperatorSymbol("C", hs=hs2_dim2)
     L = SuperOperatorSymbol("L", hs=1)
     M = SuperOperatorSymbol("M", hs=1)
     A_op = OperatorSymbol("A", hs=1)
-    gamma = symbols('gamma', positive=True)
     assert unicode(A + B) == 'A^(q₁) + B^(q₁)'
     assert unicode(A * B) == 'A^(q₁) B^(q₁)'
     assert unicode(A * C) == 'A^(q₁) ⊗ C^(q₂)'
     assert unicode(2j * A) == '2j * A^(q₁)'
-    assert unicode(gamma**2 * A) == 'γ**2 * A^(q₁)'
+    assert unicode(GAMMA**2 * A) == 'γ**2 * A^(q₁)'
     assert unicode(SuperAdjoint(A)) == 'A^(q₁)†'
     assert unicode(A - B + C) == 'A^(q₁) + C^(q₂) - B^(q₁)'
-    assert (unicode(2 * A - sqrt(gamma) * (B + C)) in
-            ['2 * A^(q₁) - sqrt(γ) * (B^(q₁) + C^(q₂))',
-             '2 * A^(q₁) - √γ * (B^(q₁) + C^(q₂))'])
+    assert (unicode(2 * A - sqrt(GAMMA) * (B + C)) in
+            SQRT_GAMMA_SOP_VARIANTS)
     assert unicode(SPre(A_op)) == 'SPre(A\u0302\u207d\xb9\u207e)'
     #                              SPre(Â⁽¹⁾)
     assert unicode(SPost(A_op)) == 'SPost(A\u0302\u207d\xb9\u207e)'
@@ -306,11 +381,20 @@ def test_unicode_sop_operations():
     assert (unicode(SuperOperatorTimesOperator(L, A_op)) ==
             'L\u207d\xb9\u207e[A\u0302\u207d\xb9\u207e]')
     #        L⁽¹⁾[Â⁽¹⁾]
-    assert (unicode(SuperOperatorTimesOperator(L, sqrt(gamma) * A_op)) in
-            ['L\u207d\xb9\u207e[\u221a\u03b3 * A\u0302\u207d\xb9\u207e]',
-             'L\u207d\xb9\u207e[sqrt(\u03b3) * A\u0302\u207d\xb9\u207e]'])
-     #        L⁽¹⁾[√γ * Â⁽¹⁾]
+    assert (unicode(SuperOperatorTimesOperator(L, sqrt(GAMMA) * A_op)) in
+            SQRT_GAMMA_SOP_TIMES_OP_VARIANTS)
     assert (unicode(SuperOperatorTimesOperator((L + 2*M), A_op)) ==
             '(L\u207d\xb9\u207e + 2 * M\u207d\xb9\u207e)'
             '[A\u0302\u207d\xb9\u207e]')
     #       (L⁽¹⁾ + 2 * M⁽¹⁾)[Â⁽¹⁾]
+
+
+def test_unicode_rendering_is_cached(hs1):
+    """Test that the unicode representation of an expression is rendered only
+    once, and re-used for the (cached) instance of an equal expression"""
+    A = OperatorSymbol("A", hs=hs1)
+    B = OperatorSymbol("B", hs=hs1)
+    expr = A + B
+    rendered = unicode(expr)
+    assert expr._unicode is rendered
+    assert unicode(A + B) is rendered